@@ -0,0 +1,3 @@
+from .core import NO_WINNER, Block, Blockchain, new_stop_flag
+
+__all__ = ["NO_WINNER", "Block", "Blockchain", "new_stop_flag"]
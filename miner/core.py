@@ -0,0 +1,386 @@
+# miner/core.py
+import ctypes
+import functools
+import hashlib
+import multiprocessing
+import time
+
+try:
+    from .fast_mine import find_nonce
+except ImportError:  # Extensão C opcional: python setup.py build_ext --inplace
+    find_nonce = None
+
+try:
+    from .nonce_search import flag_array, search_nonce, sha256_midstate
+except ImportError:  # Numba é opcional: sem ele a mineração usa apenas o hashlib
+    search_nonce = None
+
+# Quantidade de nonces testados pela extensão C ou pelo kernel Numba a cada
+# chamada. Dentro do lote o flag de parada é lido pelo próprio kernel.
+KERNEL_BATCH = 1 << 16
+
+# Quantidade de nonces testados pelo laço em Python (hashlib) entre duas
+# leituras do flag de parada
+STOP_CHECK_INTERVAL = 4096
+
+# Valor do flag de parada enquanto nenhum nonce válido foi encontrado
+NO_WINNER = (1 << 64) - 1
+
+
+def new_stop_flag(shared=False):
+    """
+    Cria o flag de parada da mineração: um inteiro de 64 bits sem sinal que
+    vale NO_WINNER até que o nonce vencedor seja gravado nele.
+
+    Com shared=True o flag fica em memória compartilhada entre processos.
+    Nos dois casos ele é lido diretamente pela extensão C e pelo kernel
+    Numba, sem passar pelo interpretador.
+    """
+    if shared:
+        return multiprocessing.Value(ctypes.c_uint64, NO_WINNER, lock=False)
+    return ctypes.c_uint64(NO_WINNER)
+
+
+class Block:
+    """
+    Classe que representa um bloco da blockchain
+
+    Estrutura do bloco:
+    - index: número sequencial do bloco na cadeia
+    - previous_hash: hash do bloco anterior
+    - timestamp: momento de criação do bloco, em nanossegundos desde a época Unix
+    - data: dados armazenados no bloco
+    - nonce: serve para randomizar o conteúdo do bloco
+    - hash: hash do bloco atual (calculado com todos os campos acima) serve para encadear blocos e
+    proteger os dados dentro de cada bloco. Se um único caractere no bloco mudar, o hash também
+    mudará alertando o sistema sobre uma possível violação.
+    """
+
+    def __init__(self, index, previous_hash, timestamp, data, nonce=0):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.timestamp = timestamp
+        self.data = data
+        self.nonce = nonce
+        self.hash = self.calculate_hash()
+
+    def __repr__(self):
+        return f"Block<idx={self.index}, nonce={self.nonce}, hash={self.hash[:16]}...>"
+
+    # index e timestamp guardam também sua forma em bytes, usada na entrada do
+    # SHA-256, para que não sejam convertidos para string a cada cálculo do
+    # hash. Os setters mantêm essa cópia em dia se o campo for reatribuído.
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, value):
+        self._index = value
+        self._index_bytes = str(value).encode()
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+        self._timestamp_bytes = str(value).encode()
+
+    def calculate_hash(self):
+        """
+        Calcula o hash do bloco usando o algoritmo de hashing SHA-256 utilizando
+        todos os campos do bloco.
+        """
+        return hashlib.sha256(self._hash_prefix() + b"%d" % self.nonce).hexdigest()
+
+    def _hash_prefix(self):
+        """
+        Retorna, já codificados em bytes, os campos do bloco que antecedem o
+        nonce na entrada do SHA-256 (index, previous_hash, timestamp e data).
+
+        data não é guardado em cache porque pode ser alterado no lugar (um
+        dict, por exemplo), e a validação precisa enxergar essa alteração.
+        """
+        return (
+            self._index_bytes
+            + self.previous_hash.encode()
+            + self._timestamp_bytes
+            + str(self.data).encode()
+        )
+
+    def start_mining(self, difficulty):
+        """
+        Prepara uma sessão de mineração.
+
+        Apenas o nonce muda entre as tentativas, então o SHA-256 é
+        inicializado uma única vez com o prefixo fixo do bloco (index,
+        previous_hash, timestamp e data). Cada tentativa copia esse estado
+        intermediário e processa somente os bytes do nonce.
+
+        A dificuldade é convertida em um alvo de 32 bytes: o hash começa com
+        difficulty zeros hexadecimais exatamente quando o digest binário é
+        menor ou igual ao alvo, o que reduz o teste de cada tentativa a uma
+        única comparação de bytes.
+
+        Retorna (prefix, base_hash, target). Esse estado não é guardado no
+        bloco, que continua podendo ser serializado (pickle/deepcopy) depois
+        de minerado.
+        """
+        prefix = self._hash_prefix()
+        base_hash = hashlib.sha256(prefix)
+        target = ((1 << (256 - 4 * difficulty)) - 1).to_bytes(32, "big")
+        return prefix, base_hash, target
+
+    def mine_block(self, difficulty, stop_flag, start_nonce=None, stride=1):
+        """
+        Método responsável pela prova de trabalho da mineração.
+
+        Através de um método intensivo, o nonce é continuamente
+        incrementado até que o hash do bloco comece com um número
+        de zeros determinado pela dificuldade.
+
+        A dificuldade determina quantos zeros iniciais o hash deve ter,
+        tornando a mineração mais difícil quanto maior for o valor.
+
+        O nonce parte de start_nonce (ou do valor atual do bloco) e avança de
+        stride em stride, permitindo que vários processos dividam o espaço de
+        nonces entre si sem repetir tentativas.
+
+        stop_flag é criado por new_stop_flag(): a mineração para quando ele
+        deixa de valer NO_WINNER, e quem encontra um nonce válido grava o
+        nonce nele.
+
+        Retorna True se um nonce válido foi encontrado.
+        """
+        if start_nonce is not None:
+            self.nonce = start_nonce
+        prefix, base_hash, target = self.start_mining(difficulty)
+        if find_nonce is not None:
+            search = functools.partial(
+                find_nonce, prefix, difficulty, stop_flag=stop_flag
+            )
+            found = self._mine_batches(search, stop_flag, stride)
+        elif search_nonce is not None:
+            midstate, tail = sha256_midstate(prefix)
+            search = functools.partial(
+                search_nonce,
+                midstate,
+                tail,
+                len(prefix),
+                4 * difficulty,
+                stop_flag=flag_array(stop_flag),
+            )
+            found = self._mine_batches(search, stop_flag, stride)
+        else:
+            found = self._mine_hashlib(base_hash, target, stop_flag, stride)
+        if found:
+            if stop_flag.value == NO_WINNER:
+                stop_flag.value = self.nonce
+            print(
+                f"[+] Processo {multiprocessing.current_process().name} minerou: nonce={self.nonce}, hash={self.hash}"
+            )
+        return found
+
+    def _mine_hashlib(self, base_hash, target, stop_flag, stride):
+        # O laço trabalha apenas com variáveis locais; nonce e hash só são
+        # gravados no bloco ao final da busca
+        nonce = self.nonce
+        while stop_flag.value == NO_WINNER:
+            for _ in range(STOP_CHECK_INTERVAL):
+                h = base_hash.copy()
+                h.update(b"%d" % nonce)
+                digest = h.digest()
+                if digest <= target:
+                    self.nonce = nonce
+                    self.hash = digest.hex()
+                    return True
+                nonce += stride
+        self.nonce = nonce
+        return False
+
+    def _mine_batches(self, search, stop_flag, stride):
+        """
+        Executa uma busca compilada (extensão C ou kernel Numba) em lotes de
+        KERNEL_BATCH nonces.
+
+        search(start_nonce, stride, max_attempts) retorna o nonce encontrado
+        ou -1 se nenhum nonce do lote for válido ou se o flag de parada
+        mudar durante o lote.
+        """
+        while stop_flag.value == NO_WINNER:
+            nonce = search(self.nonce, stride, KERNEL_BATCH)
+            if nonce >= 0:
+                self.nonce = nonce
+                self.hash = self.calculate_hash()
+                return True
+            self.nonce += stride * KERNEL_BATCH
+        return False
+
+
+# Flag de parada compartilhado com os processos de mineração. Ele é entregue
+# pelo initializer do Pool, pois objetos em memória compartilhada do
+# multiprocessing não podem ser enviados como argumento de uma tarefa.
+_stop_flag = None
+
+
+def _init_worker(stop_flag):
+    global _stop_flag
+    _stop_flag = stop_flag
+
+
+def _mine_range(block, difficulty, stride, start):
+    """
+    Função executada por cada processo de mineração.
+
+    Minera a cópia do bloco recebida pelo processo a partir do nonce start,
+    avançando de stride em stride, até encontrar um nonce válido ou até o
+    flag de parada ser sinalizado. Retorna (nonce, hash) do bloco minerado
+    ou None.
+
+    O bloco chega ao processo já serializado, então não é construído de novo
+    (nem tem seu hash inicial recalculado) em cada processo.
+    """
+    if block.mine_block(difficulty, _stop_flag, start_nonce=start, stride=stride):
+        return block.nonce, block.hash
+    return None
+
+
+class Blockchain:
+    """
+    Classe que representa a blockchain.
+
+    A blockchain é uma lista encadeada de blocos onde:
+    - Cada bloco contém o hash do bloco anterior
+    - O primeiro bloco é o bloco gênese
+    - A dificuldade determina o nível de complexidade da mineração
+    """
+
+    def __init__(self, difficulty=4):
+        self.chain = [self.create_genesis_block()]
+        self.difficulty = difficulty
+
+    def create_genesis_block(self):
+        return Block(0, "0", time.time_ns(), "GenesisBlock")
+
+    def get_latest_block(self):
+        return self.chain[-1]
+
+    def add_block(self, new_block):
+        new_block.previous_hash = self.get_latest_block().hash
+        new_block.mine_block(self.difficulty, new_stop_flag())
+        self.chain.append(new_block)
+
+    def validate_blockchain(self):
+        return self._validate_chain(self.chain)
+
+    def _validate_chain(self, chain):
+        """
+        Método interno para validar uma cadeia de blocos.
+        """
+        for i in range(1, len(chain)):
+            current_block = chain[i]
+            previous_block = chain[i - 1]
+
+            # Verifica se o hash do bloco atual é válido
+            calculated_hash = current_block.calculate_hash()
+            if current_block.hash != calculated_hash:
+                print(
+                    f"❌ Bloco {i} inválido: hash diferente do calculado",
+                    f"\nHash calculado: {calculated_hash}",
+                    f"\nHash do bloco: {current_block.hash}",
+                )
+                return False
+
+            # Verifica se o hash anterior está correto
+            if current_block.previous_hash != previous_block.hash:
+                print(
+                    f"❌ Bloco {i} inválido: hash anterior diferente do anterior",
+                    f"\nHash anterior do bloco: {current_block.previous_hash}",
+                    f"\nHash anterior: {previous_block.hash}",
+                )
+                return False
+        return True
+
+    def _validate_pair(self, prev, new):
+        """
+        Valida um bloco recém-minerado em relação ao bloco anterior.
+
+        Como o restante da cadeia já foi validado, basta conferir o hash do
+        novo bloco, sua prova de trabalho e o encadeamento com o anterior, sem
+        copiar nem percorrer a cadeia inteira.
+        """
+        return (
+            new.hash == new.calculate_hash()
+            and new.hash.startswith("0" * self.difficulty)
+            and new.previous_hash == prev.hash
+        )
+
+    def concurrent_mining(self, data, num_workers):
+        """
+        Função responsável por minerar blocos de forma concorrente.
+
+        A função cria um template do próximo bloco e um flag de parada em memória
+        compartilhada.
+        Em seguida, cria um Pool com o número de processos especificado. Cada
+        processo executa a função _mine_range(), que faz a prova de trabalho
+        (mineração) sobre uma faixa intercalada de nonces: o processo i testa
+        os nonces i, i + num_workers, i + 2 * num_workers, ...
+
+        Cada processo tem seu próprio GIL, então a mineração escala com o
+        número de núcleos disponíveis.
+        """
+        # Obtém o último bloco da cadeia para usar como base
+        latest_block = self.get_latest_block()
+
+        # Cria um template do bloco que será minerado
+        block_template = Block(
+            latest_block.index + 1,  # Incrementa o índice
+            latest_block.hash,  # Usa o hash do último bloco como previous_hash
+            time.time_ns(),  # Timestamp atual (nanossegundos desde a época Unix)
+            data,  # Dados a serem armazenados
+        )
+
+        # Flag que recebe o nonce do primeiro bloco válido encontrado
+        stop_flag = new_stop_flag(shared=True)
+
+        mine = functools.partial(
+            _mine_range, block_template, self.difficulty, num_workers
+        )
+
+        # Cria o Pool de processos e distribui um nonce inicial para cada um
+        mined = None
+        start_time = time.time()
+        with multiprocessing.Pool(
+            num_workers, initializer=_init_worker, initargs=(stop_flag,)
+        ) as pool:
+            for found in pool.imap_unordered(mine, range(num_workers)):
+                if found is None:
+                    continue
+
+                # O restante da cadeia foi validado ao ser construído, então
+                # basta validar o novo bloco contra o último da cadeia
+                block_template.nonce, block_template.hash = found
+                if self._validate_pair(latest_block, block_template):
+                    mined = block_template
+                    print(
+                        f"[+] Bloco válido minerado: nonce={mined.nonce}, hash={mined.hash}"
+                    )
+                    # Ao sair do bloco with o Pool é encerrado
+                    break
+                print("[-] Bloco minerado inválido, descartando...")
+
+        # Calcula o tempo total de mineração
+        elapsed_time = time.time() - start_time
+
+        # Adiciona o bloco minerado à cadeia se for válido
+        if mined:
+            self.chain.append(mined)
+            print(f"\n✔ Bloco válido adicionado à cadeia: {mined}")
+        else:
+            print("\n✖ Nenhum bloco válido foi minerado.")
+
+        print(
+            f"Tempo total de mineração concorrente ({num_workers} processos): {elapsed_time:.2f}s"
+        )
@@ -0,0 +1,470 @@
+/*
+ * miner/fast_mine.c
+ *
+ * Extensão C com o laço de busca de nonce.
+ *
+ * O SHA-256 é feito pelas rotinas do OpenSSL, que escolhem em tempo de
+ * execução a implementação mais rápida do processador (incluindo as
+ * instruções SHA-NI). O contexto com o prefixo fixo do bloco é calculado
+ * uma vez e copiado a cada tentativa, então só os dígitos do nonce e o
+ * padding passam pela função de compressão.
+ *
+ * Em processadores x86-64 sem SHA-NI, mas com AVX2, os nonces são testados
+ * de 8 em 8: cada lane de 32 bits de um registrador AVX2 carrega o estado
+ * SHA-256 de um nonce diferente e uma única sequência de 64 rodadas
+ * vetorizadas produz 8 hashes.
+ *
+ * A busca pode receber um flag compartilhado de 64 bits (por exemplo um
+ * multiprocessing.Value(ctypes.c_uint64)) que vale UINT64_MAX enquanto
+ * nenhum processo encontrou um nonce. O flag é lido a cada 4096 tentativas
+ * e o primeiro processo que encontra um nonce válido grava nele esse nonce,
+ * o que faz os demais encerrarem a busca.
+ *
+ * Compilação: python setup.py build_ext --inplace
+ */
+#define PY_SSIZE_T_CLEAN
+#define OPENSSL_SUPPRESS_DEPRECATED
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+#include <openssl/sha.h>
+
+#if defined(__x86_64__) && defined(__GNUC__)
+#define HAVE_X8 1
+#include <cpuid.h>
+#include <immintrin.h>
+#endif
+
+#define LANES 8
+#define MAX_DIGITS 20
+#define NO_WINNER UINT64_MAX
+#define STOP_CHECK_MASK 0xFFF
+
+/* Escreve n em ASCII decimal e retorna a quantidade de dígitos. */
+static int
+write_decimal(unsigned char *out, unsigned long long n)
+{
+    unsigned char tmp[20];
+    int len = 0;
+    do {
+        tmp[len++] = '0' + n % 10;
+        n /= 10;
+    } while (n);
+    for (int i = 0; i < len; i++)
+        out[i] = tmp[len - 1 - i];
+    return len;
+}
+
+/*
+ * O hash começa com difficulty zeros hexadecimais exatamente quando o
+ * digest é menor ou igual a este alvo.
+ */
+static void
+build_target(unsigned char *target, int difficulty)
+{
+    memset(target, 0xff, SHA256_DIGEST_LENGTH);
+    memset(target, 0x00, difficulty / 2);
+    if (difficulty & 1)
+        target[difficulty / 2] = 0x0f;
+}
+
+/* Estado de uma busca: o prefixo já absorvido e o alvo da dificuldade. */
+typedef struct {
+    SHA256_CTX base;                       /* contexto com o prefixo inteiro */
+    uint32_t midstate[8];                  /* estado após os blocos completos */
+    unsigned char tail[SHA256_CBLOCK];     /* bytes restantes do prefixo */
+    size_t tail_len;
+    size_t prefix_len;
+    int difficulty;
+    unsigned char target[SHA256_DIGEST_LENGTH];
+    volatile uint64_t *stop_flag;          /* NULL se não houver flag */
+} search_t;
+
+static void
+search_init(search_t *s, const unsigned char *prefix, size_t len, int difficulty)
+{
+    size_t full = len - len % SHA256_CBLOCK;
+
+    SHA256_Init(&s->base);
+    SHA256_Update(&s->base, prefix, full);
+    memcpy(s->midstate, s->base.h, sizeof(s->midstate));
+    SHA256_Update(&s->base, prefix + full, len - full);
+
+    s->tail_len = len - full;
+    memcpy(s->tail, prefix + full, s->tail_len);
+    s->prefix_len = len;
+    s->difficulty = difficulty;
+    build_target(s->target, difficulty);
+    s->stop_flag = NULL;
+}
+
+/* Indica se algum processo já gravou um nonce vencedor no flag. */
+static int
+stopped(const search_t *s)
+{
+    return s->stop_flag != NULL && *s->stop_flag != NO_WINNER;
+}
+
+/* Grava o nonce no flag, a menos que outro processo tenha chegado antes. */
+static void
+claim(search_t *s, unsigned long long nonce)
+{
+    if (s->stop_flag == NULL)
+        return;
+#ifdef __GNUC__
+    uint64_t expected = NO_WINNER;
+    __atomic_compare_exchange_n(s->stop_flag, &expected, nonce, 0,
+                                __ATOMIC_SEQ_CST, __ATOMIC_SEQ_CST);
+#else
+    if (*s->stop_flag == NO_WINNER)
+        *s->stop_flag = nonce;
+#endif
+}
+
+/* Testa um único nonce já escrito em ASCII. */
+static int
+check_scalar(const search_t *s, const unsigned char *digits, int ndigits)
+{
+    unsigned char digest[SHA256_DIGEST_LENGTH];
+    SHA256_CTX ctx = s->base;
+    SHA256_Update(&ctx, digits, ndigits);
+    SHA256_Final(digest, &ctx);
+    return memcmp(digest, s->target, SHA256_DIGEST_LENGTH) <= 0;
+}
+
+/* Soma add aos dígitos ASCII; retorna 1 se sobrou carry (mais um dígito). */
+static int
+add_decimal(unsigned char *digits, int ndigits, unsigned long long add)
+{
+    for (int j = ndigits - 1; add && j >= 0; j--) {
+        unsigned long long v = digits[j] - '0' + add;
+        digits[j] = '0' + v % 10;
+        add = v / 10;
+    }
+    return add != 0;
+}
+
+static long long
+search_scalar(const search_t *s, unsigned long long start,
+              unsigned long long stride, unsigned long long max_attempts)
+{
+    unsigned char digits[MAX_DIGITS];
+    int ndigits = write_decimal(digits, start);
+    unsigned long long nonce = start;
+
+    for (unsigned long long i = 0; i < max_attempts; i++) {
+        if ((i & STOP_CHECK_MASK) == 0 && stopped(s))
+            return -1;
+        if (check_scalar(s, digits, ndigits))
+            return (long long)nonce;
+        nonce += stride;
+        if (add_decimal(digits, ndigits, stride))
+            ndigits = write_decimal(digits, nonce);
+    }
+    return -1;
+}
+
+#ifdef HAVE_X8
+#define AVX2 __attribute__((target("avx2")))
+
+#define ROTR(x, n) \
+    _mm256_or_si256(_mm256_srli_epi32((x), (n)), _mm256_slli_epi32((x), 32 - (n)))
+#define ADD(a, b) _mm256_add_epi32((a), (b))
+#define XOR(a, b) _mm256_xor_si256((a), (b))
+
+static const uint32_t K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+};
+
+static int
+cpu_has_sha_ni(void)
+{
+    unsigned int a, b, c, d;
+    if (!__get_cpuid_count(7, 0, &a, &b, &c, &d))
+        return 0;
+    return (b >> 29) & 1;
+}
+
+/* Compressão SHA-256 de 8 mensagens independentes, uma por lane. */
+static AVX2 void
+compress_x8(__m256i state[8], const unsigned char *const blocks[LANES])
+{
+    __m256i w[64];
+
+    for (int j = 0; j < 16; j++) {
+        uint32_t v[LANES];
+        for (int k = 0; k < LANES; k++) {
+            uint32_t x;
+            memcpy(&x, blocks[k] + 4 * j, 4);
+            v[k] = __builtin_bswap32(x);
+        }
+        w[j] = _mm256_loadu_si256((const __m256i *)v);
+    }
+    for (int j = 16; j < 64; j++) {
+        __m256i s0 = XOR(XOR(ROTR(w[j - 15], 7), ROTR(w[j - 15], 18)),
+                         _mm256_srli_epi32(w[j - 15], 3));
+        __m256i s1 = XOR(XOR(ROTR(w[j - 2], 17), ROTR(w[j - 2], 19)),
+                         _mm256_srli_epi32(w[j - 2], 10));
+        w[j] = ADD(ADD(w[j - 16], s0), ADD(w[j - 7], s1));
+    }
+
+    __m256i a = state[0], b = state[1], c = state[2], d = state[3];
+    __m256i e = state[4], f = state[5], g = state[6], h = state[7];
+    for (int j = 0; j < 64; j++) {
+        __m256i s1 = XOR(XOR(ROTR(e, 6), ROTR(e, 11)), ROTR(e, 25));
+        __m256i ch = XOR(_mm256_and_si256(e, f), _mm256_andnot_si256(e, g));
+        __m256i t1 = ADD(ADD(ADD(h, s1), ADD(ch, _mm256_set1_epi32((int)K[j]))), w[j]);
+        __m256i s0 = XOR(XOR(ROTR(a, 2), ROTR(a, 13)), ROTR(a, 22));
+        __m256i maj = XOR(XOR(_mm256_and_si256(a, b), _mm256_and_si256(a, c)),
+                          _mm256_and_si256(b, c));
+        __m256i t2 = ADD(s0, maj);
+        h = g;
+        g = f;
+        f = e;
+        e = ADD(d, t1);
+        d = c;
+        c = b;
+        b = a;
+        a = ADD(t1, t2);
+    }
+
+    state[0] = ADD(state[0], a);
+    state[1] = ADD(state[1], b);
+    state[2] = ADD(state[2], c);
+    state[3] = ADD(state[3], d);
+    state[4] = ADD(state[4], e);
+    state[5] = ADD(state[5], f);
+    state[6] = ADD(state[6], g);
+    state[7] = ADD(state[7], h);
+}
+
+/*
+ * Máscara de 8 bits com as lanes cujo hash começa com difficulty zeros
+ * hexadecimais, ou seja, com 4 * difficulty bits zerados.
+ */
+static AVX2 int
+zero_bits_mask(const __m256i state[8], int difficulty)
+{
+    __m256i zero = _mm256_setzero_si256();
+    __m256i ok = _mm256_cmpeq_epi32(zero, zero);
+    int bits = 4 * difficulty;
+
+    for (int k = 0; k < 8 && bits > 0; k++, bits -= 32) {
+        __m256i word = state[k];
+        if (bits < 32)
+            word = _mm256_srl_epi32(word, _mm_cvtsi32_si128(32 - bits));
+        ok = _mm256_and_si256(ok, _mm256_cmpeq_epi32(word, zero));
+    }
+    return _mm256_movemask_ps(_mm256_castsi256_ps(ok));
+}
+
+/* Escreve os dígitos do nonce e o padding do SHA-256 na mensagem da lane. */
+static int
+write_lane(const search_t *s, unsigned char *msg, unsigned long long nonce,
+           int *ndigits)
+{
+    unsigned char *pos = msg + s->tail_len;
+    *ndigits = write_decimal(pos, nonce);
+    pos += *ndigits;
+    *pos++ = 0x80;
+
+    size_t used = pos - msg;
+    size_t end = used + 8 <= SHA256_CBLOCK ? SHA256_CBLOCK : 2 * SHA256_CBLOCK;
+    memset(pos, 0, end - 8 - used);
+
+    unsigned long long bit_len = (unsigned long long)(s->prefix_len + *ndigits) * 8;
+    for (int i = 0; i < 8; i++)
+        msg[end - 1 - i] = (unsigned char)(bit_len >> (8 * i));
+    return (int)(end / SHA256_CBLOCK);
+}
+
+static AVX2 long long
+search_x8(const search_t *s, unsigned long long start,
+          unsigned long long stride, unsigned long long max_attempts)
+{
+    unsigned char msg[LANES][2 * SHA256_CBLOCK];
+    int ndigits[LANES], nblocks[LANES];
+    const unsigned char *blocks[LANES];
+    __m256i mid[8];
+    unsigned long long group_stride = stride * LANES;
+    unsigned long long nonce = start;
+    unsigned long long done = 0;
+
+    for (int i = 0; i < 8; i++)
+        mid[i] = _mm256_set1_epi32((int)s->midstate[i]);
+    for (int k = 0; k < LANES; k++) {
+        memcpy(msg[k], s->tail, s->tail_len);
+        nblocks[k] = write_lane(s, msg[k], nonce + k * stride, &ndigits[k]);
+    }
+
+    while (max_attempts - done >= LANES) {
+        if ((done & STOP_CHECK_MASK) == 0 && stopped(s))
+            return -1;
+        if (ndigits[0] == ndigits[LANES - 1]) {
+            __m256i state[8];
+            memcpy(state, mid, sizeof(state));
+            for (int k = 0; k < LANES; k++)
+                blocks[k] = msg[k];
+            compress_x8(state, blocks);
+            if (nblocks[0] == 2) {
+                for (int k = 0; k < LANES; k++)
+                    blocks[k] = msg[k] + SHA256_CBLOCK;
+                compress_x8(state, blocks);
+            }
+            int mask = zero_bits_mask(state, s->difficulty);
+            if (mask)
+                return (long long)(nonce + __builtin_ctz(mask) * stride);
+        }
+        else {
+            /* O grupo cruza uma potência de 10: as lanes têm tamanhos de
+             * mensagem diferentes e são testadas uma a uma. */
+            for (int k = 0; k < LANES; k++)
+                if (check_scalar(s, msg[k] + s->tail_len, ndigits[k]))
+                    return (long long)(nonce + k * stride);
+        }
+
+        nonce += group_stride;
+        done += LANES;
+        for (int k = 0; k < LANES; k++) {
+            if (add_decimal(msg[k] + s->tail_len, ndigits[k], group_stride))
+                nblocks[k] = write_lane(s, msg[k], nonce + k * stride, &ndigits[k]);
+        }
+    }
+
+    return search_scalar(s, nonce, stride, max_attempts - done);
+}
+#endif /* HAVE_X8 */
+
+static int use_x8;
+
+static PyObject *
+run_search(PyObject *args, PyObject *kwargs, int x8)
+{
+    static char *kwlist[] = {"prefix", "difficulty", "start_nonce", "stride",
+                             "max_attempts", "stop_flag", NULL};
+    Py_buffer prefix, flag = {0};
+    PyObject *flag_obj = Py_None;
+    int difficulty;
+    unsigned long long start, stride, max_attempts;
+    search_t s;
+    long long found;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "y*iKKK|O", kwlist, &prefix,
+                                     &difficulty, &start, &stride,
+                                     &max_attempts, &flag_obj))
+        return NULL;
+    if (difficulty < 0 || difficulty > 2 * SHA256_DIGEST_LENGTH) {
+        PyBuffer_Release(&prefix);
+        PyErr_SetString(PyExc_ValueError, "difficulty must be between 0 and 64");
+        return NULL;
+    }
+
+    search_init(&s, prefix.buf, prefix.len, difficulty);
+    PyBuffer_Release(&prefix);
+
+    if (flag_obj != Py_None) {
+        if (PyObject_GetBuffer(flag_obj, &flag, PyBUF_WRITABLE) < 0)
+            return NULL;
+        if (flag.len < (Py_ssize_t)sizeof(uint64_t)) {
+            PyBuffer_Release(&flag);
+            PyErr_SetString(PyExc_ValueError, "stop_flag must hold a 64-bit integer");
+            return NULL;
+        }
+        s.stop_flag = (volatile uint64_t *)flag.buf;
+    }
+
+    /* A busca só usa s (que já tem sua própria cópia do prefixo) e a memória
+     * do flag, mantida pelo buffer exportado, então o GIL pode ser liberado
+     * e outras threads Python rodam em paralelo com ela. */
+    Py_BEGIN_ALLOW_THREADS
+#ifdef HAVE_X8
+    if (x8)
+        found = search_x8(&s, start, stride, max_attempts);
+    else
+#endif
+        found = search_scalar(&s, start, stride, max_attempts);
+    Py_END_ALLOW_THREADS
+
+    if (found >= 0)
+        claim(&s, (unsigned long long)found);
+    if (s.stop_flag != NULL)
+        PyBuffer_Release(&flag);
+
+    return PyLong_FromLongLong(found);
+}
+
+PyDoc_STRVAR(find_nonce_doc,
+"find_nonce(prefix, difficulty, start_nonce, stride, max_attempts,\n"
+"           stop_flag=None)\n"
+"--\n"
+"\n"
+"Testa até max_attempts nonces a partir de start_nonce, avançando de\n"
+"stride em stride, e retorna o primeiro cujo SHA-256 de prefix + nonce\n"
+"(em ASCII) começa com difficulty zeros hexadecimais, ou -1.\n"
+"\n"
+"stop_flag é um objeto gravável de 64 bits (como ctypes.c_uint64) que\n"
+"vale UINT64_MAX enquanto não há vencedor. A busca retorna -1 quando o\n"
+"flag muda e grava nele o nonce encontrado.\n"
+"\n"
+"O GIL é liberado durante a busca.\n"
+"\n"
+"Usa o caminho AVX2 de 8 lanes quando o processador tem AVX2 mas não\n"
+"SHA-NI; caso contrário usa o SHA-256 do OpenSSL.");
+
+static PyObject *
+find_nonce(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    return run_search(args, kwargs, use_x8);
+}
+
+PyDoc_STRVAR(find_nonce_x8_doc,
+"find_nonce_x8(prefix, difficulty, start_nonce, stride, max_attempts,\n"
+"              stop_flag=None)\n"
+"--\n"
+"\n"
+"Igual a find_nonce(), mas sempre usa o caminho AVX2 de 8 lanes. Útil\n"
+"para comparar os dois caminhos em processadores com SHA-NI.");
+
+static PyObject *
+find_nonce_x8(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+#ifdef HAVE_X8
+    if (__builtin_cpu_supports("avx2"))
+        return run_search(args, kwargs, 1);
+#endif
+    PyErr_SetString(PyExc_RuntimeError, "AVX2 is not available on this machine");
+    return NULL;
+}
+
+static PyMethodDef fast_mine_methods[] = {
+    {"find_nonce", (PyCFunction)(void (*)(void))find_nonce,
+     METH_VARARGS | METH_KEYWORDS, find_nonce_doc},
+    {"find_nonce_x8", (PyCFunction)(void (*)(void))find_nonce_x8,
+     METH_VARARGS | METH_KEYWORDS, find_nonce_x8_doc},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef fast_mine_module = {
+    PyModuleDef_HEAD_INIT,
+    "miner.fast_mine",
+    "Busca de nonce em C usando o SHA-256 do OpenSSL.",
+    -1,
+    fast_mine_methods,
+};
+
+PyMODINIT_FUNC
+PyInit_fast_mine(void)
+{
+#ifdef HAVE_X8
+    __builtin_cpu_init();
+    use_x8 = __builtin_cpu_supports("avx2") && !cpu_has_sha_ni();
+#endif
+    return PyModule_Create(&fast_mine_module);
+}
@@ -0,0 +1,225 @@
+# miner/nonce_search.py
+"""
+Kernel de busca de nonce compilado com Numba.
+
+O SHA-256 é implementado diretamente sobre arrays numéricos para que o laço
+de mineração rode fora do interpretador e com o GIL liberado (nogil=True),
+permitindo que várias threads minerem em paralelo de verdade.
+
+As palavras de 32 bits são mantidas em int64 e mascaradas com 0xFFFFFFFF
+após cada operação, o que evita overflow tanto no código compilado quanto
+ao executar as funções como Python puro.
+"""
+import numpy as np
+from numba import njit
+
+_MASK = 0xFFFFFFFF
+
+# Valor do flag de parada enquanto nenhum processo encontrou um nonce
+NO_WINNER = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Intervalo (em tentativas) entre duas leituras do flag de parada
+_STOP_CHECK_MASK = 0xFFF
+
+_H0 = np.array(
+    [
+        0x6A09E667, 0xBB67AE85, 0x3C6EF372, 0xA54FF53A,
+        0x510E527F, 0x9B05688C, 0x1F83D9AB, 0x5BE0CD19,
+    ],
+    dtype=np.int64,
+)  # fmt: skip
+
+_K = np.array(
+    [
+        0x428A2F98, 0x71374491, 0xB5C0FBCF, 0xE9B5DBA5, 0x3956C25B, 0x59F111F1, 0x923F82A4, 0xAB1C5ED5,
+        0xD807AA98, 0x12835B01, 0x243185BE, 0x550C7DC3, 0x72BE5D74, 0x80DEB1FE, 0x9BDC06A7, 0xC19BF174,
+        0xE49B69C1, 0xEFBE4786, 0x0FC19DC6, 0x240CA1CC, 0x2DE92C6F, 0x4A7484AA, 0x5CB0A9DC, 0x76F988DA,
+        0x983E5152, 0xA831C66D, 0xB00327C8, 0xBF597FC7, 0xC6E00BF3, 0xD5A79147, 0x06CA6351, 0x14292967,
+        0x27B70A85, 0x2E1B2138, 0x4D2C6DFC, 0x53380D13, 0x650A7354, 0x766A0ABB, 0x81C2C92E, 0x92722C85,
+        0xA2BFE8A1, 0xA81A664B, 0xC24B8B70, 0xC76C51A3, 0xD192E819, 0xD6990624, 0xF40E3585, 0x106AA070,
+        0x19A4C116, 0x1E376C08, 0x2748774C, 0x34B0BCB5, 0x391C0CB3, 0x4ED8AA4A, 0x5B9CCA4F, 0x682E6FF3,
+        0x748F82EE, 0x78A5636F, 0x84C87814, 0x8CC70208, 0x90BEFFFA, 0xA4506CEB, 0xBEF9A3F7, 0xC67178F2,
+    ],
+    dtype=np.int64,
+)  # fmt: skip
+
+
+@njit(nogil=True, cache=True)
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+
+@njit(nogil=True, cache=True)
+def _compress(state, buf, offset, w):
+    """
+    Aplica a função de compressão do SHA-256 sobre o bloco de 64 bytes que
+    começa em buf[offset], atualizando state no lugar.
+    """
+    for i in range(16):
+        j = offset + 4 * i
+        w[i] = (
+            (np.int64(buf[j]) << 24)
+            | (np.int64(buf[j + 1]) << 16)
+            | (np.int64(buf[j + 2]) << 8)
+            | np.int64(buf[j + 3])
+        )
+    for i in range(16, 64):
+        s0 = _rotr(w[i - 15], 7) ^ _rotr(w[i - 15], 18) ^ (w[i - 15] >> 3)
+        s1 = _rotr(w[i - 2], 17) ^ _rotr(w[i - 2], 19) ^ (w[i - 2] >> 10)
+        w[i] = (w[i - 16] + s0 + w[i - 7] + s1) & _MASK
+
+    a, b, c, d = state[0], state[1], state[2], state[3]
+    e, f, g, h = state[4], state[5], state[6], state[7]
+    for i in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ ((e ^ _MASK) & g)
+        t1 = (h + s1 + ch + _K[i] + w[i]) & _MASK
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+
+@njit(nogil=True, cache=True)
+def _absorb(state, data, nblocks):
+    w = np.empty(64, np.int64)
+    for i in range(nblocks):
+        _compress(state, data, 64 * i, w)
+
+
+@njit(nogil=True, cache=True)
+def _has_leading_zero_bits(state, zero_bits):
+    full = zero_bits // 32
+    for i in range(full):
+        if state[i] != 0:
+            return False
+    rem = zero_bits % 32
+    if rem:
+        return (state[full] >> (32 - rem)) == 0
+    return True
+
+
+@njit(nogil=True, cache=True)
+def _write_message(buf, tail_len, prefix_len, nonce):
+    """
+    Escreve o nonce em ASCII logo após o restante do prefixo, seguido do
+    padding do SHA-256 (0x80, zeros e o tamanho da mensagem em bits).
+
+    Retorna a quantidade de dígitos escritos e o tamanho da mensagem com
+    padding (64 ou 128 bytes).
+    """
+    ndigits = 1
+    n = nonce // 10
+    while n:
+        ndigits += 1
+        n //= 10
+    n = nonce
+    for i in range(tail_len + ndigits - 1, tail_len - 1, -1):
+        buf[i] = 48 + n % 10
+        n //= 10
+
+    pos = tail_len + ndigits
+    buf[pos] = 0x80
+    pos += 1
+    end = 64 if pos + 8 <= 64 else 128
+    for i in range(pos, end - 8):
+        buf[i] = 0
+    bit_len = (prefix_len + ndigits) * 8
+    for i in range(8):
+        buf[end - 1 - i] = (bit_len >> (8 * i)) & 0xFF
+    return ndigits, end
+
+
+@njit(nogil=True, cache=True)
+def search_nonce(
+    midstate, tail, prefix_len, zero_bits, start_nonce, stride, max_attempts, stop_flag
+):
+    """
+    Testa até max_attempts nonces a partir de start_nonce, avançando de
+    stride em stride.
+
+    midstate é o estado do SHA-256 após absorver os blocos completos do
+    prefixo do bloco e tail são os bytes restantes desse prefixo. Retorna o
+    primeiro nonce cujo hash começa com zero_bits bits zerados, ou -1.
+
+    stop_flag é um array uint64 de uma posição (veja flag_array()), lido a
+    cada 4096 tentativas: se deixar de valer NO_WINNER, a busca retorna -1.
+    Ao encontrar um nonce válido, o kernel o grava no flag.
+
+    A mensagem fica em um buffer fixo: a cada tentativa o stride é somado
+    diretamente aos dígitos ASCII do nonce, e o nonce e o padding só são
+    reescritos por completo quando o número de dígitos aumenta.
+    """
+    tail_len = tail.shape[0]
+    buf = np.zeros(128, np.uint8)
+    buf[:tail_len] = tail
+    state = np.empty(8, np.int64)
+    w = np.empty(64, np.int64)
+
+    nonce = start_nonce
+    ndigits, end = _write_message(buf, tail_len, prefix_len, nonce)
+    for attempt in range(max_attempts):
+        if (attempt & _STOP_CHECK_MASK) == 0 and stop_flag[0] != NO_WINNER:
+            return -1
+
+        state[:] = midstate
+        _compress(state, buf, 0, w)
+        if end == 128:
+            _compress(state, buf, 64, w)
+
+        if _has_leading_zero_bits(state, zero_bits):
+            if stop_flag[0] == NO_WINNER:
+                stop_flag[0] = nonce
+            return nonce
+
+        # Soma o stride aos dígitos ASCII, do menos para o mais significativo
+        nonce += stride
+        carry = stride
+        i = tail_len + ndigits - 1
+        while carry and i >= tail_len:
+            v = np.int64(buf[i]) - 48 + carry
+            buf[i] = 48 + v % 10
+            carry = v // 10
+            i -= 1
+        if carry:
+            ndigits, end = _write_message(buf, tail_len, prefix_len, nonce)
+    return -1
+
+
+def sha256_midstate(prefix):
+    """
+    Absorve os blocos completos de 64 bytes do prefixo.
+
+    Retorna o estado intermediário do SHA-256 e os bytes que sobraram, no
+    formato esperado por search_nonce().
+    """
+    data = np.frombuffer(prefix, dtype=np.uint8)
+    nblocks = len(data) // 64
+    state = _H0.copy()
+    _absorb(state, data, nblocks)
+    return state, data[nblocks * 64 :].copy()
+
+
+def flag_array(stop_flag):
+    """
+    Expõe um flag de parada (ctypes.c_uint64 ou multiprocessing.Value com
+    esse tipo) como array uint64 que compartilha a mesma memória, no formato
+    esperado por search_nonce().
+    """
+    return np.frombuffer(stop_flag, dtype=np.uint64)
@@ -0,0 +1,11 @@
+from setuptools import Extension, setup
+
+# Compila a extensão C opcional de mineração:
+#     python setup.py build_ext --inplace
+setup(
+    name="blockchain-miner",
+    packages=["miner"],
+    ext_modules=[
+        Extension("miner.fast_mine", ["miner/fast_mine.c"], libraries=["crypto"])
+    ],
+)